@@ -8,22 +8,24 @@ and forwards them to a target channel for automated trading.
 
 import asyncio
 import re
-from telethon import TelegramClient, events, functions, types
-from telethon.sessions import StringSession
-from telethon.errors import SessionPasswordNeededError
+from telethon import TelegramClient, events
+from telethon.errors import SessionPasswordNeededError, FloodWaitError
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 from typing import List, Dict
-import json
 import os
-import base64
-import aiohttp
-import io
 import time
+import random
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 import sys
-from token_tracker import TokenTracker
+import signal
+from collections import OrderedDict
+from token_tracker import TokenTracker, _atomic_write
 from datetime import datetime
+import orjson
 
 __version__ = "1.0.0"
 
@@ -37,50 +39,145 @@ if sys.platform == "win32":
 # Use Path for cross-platform compatibility
 BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / 'sol_listener_config.json'
-TEMP_DIR = BASE_DIR / 'temp_images'
+TOKENS_FILE = BASE_DIR / 'processed_tokens.json'
+TOKENS_LOG_FILE = BASE_DIR / 'processed_tokens.log'  # Tokens added since the last snapshot
 ENV_FILE = BASE_DIR / '.env'
 LOGS_DIR = BASE_DIR / 'logs'
 
 # Create required directories
-os.makedirs(TEMP_DIR, exist_ok=True)
-os.makedirs(LOGS_DIR, exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(LOGS_DIR / 'bot.log', encoding='utf-8')
-    ]
+LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the strftime result for records logged in the same second"""
+
+    _cached_second = None
+    _cached_time = ''
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_time = time.strftime('%Y-%m-%d %H:%M:%S', self.converter(second))
+        return '%s,%03d' % (self._cached_time, record.msecs)
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message and traceback formatting to the listener thread"""
+
+    def prepare(self, record):
+        # The stock prepare() formats on the calling thread (the event loop) so the
+        # record can be pickled; this queue never leaves the process, so skip that
+        return record
+
+# Configure logging: records are queued, then formatted and written by a
+# background thread so neither formatting nor console/file I/O blocks the event loop
+_log_formatter = _CachedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler(LOGS_DIR / 'bot.log', encoding='utf-8')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(_DeferredQueueHandler(_log_queue))
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush queued records on exit
+
+# Solana contract address patterns (explorer links first, raw base58 as fallback)
+_CA_LINK_PATTERN = r'(?:dexscreener\.com/solana|birdeye\.so/token|solscan\.io/token|jup\.ag/swap/[^-]+-|pump\.fun/coin|gmgn\.ai/sol/token)/([1-9A-HJ-NP-Za-km-z]{32,44})'
+_CA_PATTERN = r'\b([1-9A-HJ-NP-Za-km-z]{32,44})\b'
+try:
+    import re2  # Optional: linear-time RE2 matcher; its \b is already ASCII-only
+except ImportError:
+    # Base58 is pure ASCII, so re.ASCII lets \b skip Unicode word-class lookups
+    _CA_LINK_RE = re.compile(_CA_LINK_PATTERN, re.ASCII)
+    _CA_RE = re.compile(_CA_PATTERN, re.ASCII)
+else:
+    _CA_LINK_RE = re2.compile(_CA_LINK_PATTERN)
+    _CA_RE = re2.compile(_CA_PATTERN)
+# Each pattern is paired with a substring it can't match without, checked first
+# with a cheap `in` so most chat text never reaches the link regex ('' always passes)
+_CA_PATTERNS = (('/', _CA_LINK_RE), ('', _CA_RE))
+
+# Target chat message patterns
+_BUY_NAME_RE = re.compile(r'buy \$([a-zA-Z0-9_]+)', re.IGNORECASE)
+_MCAP_PATTERNS = (
+    re.compile(r'MC:\s*\$?([\d,]+\.?\d*)([KMBkmb]?)'),  # Standard format
+    re.compile(r'Market Cap:?\s*\$?([\d,]+\.?\d*)([KMBkmb]?)'),  # Alternative format
+    re.compile(r'MCap:?\s*\$?([\d,]+\.?\d*)([KMBkmb]?)')  # Short format
+)
+_MCAP_MULTIPLIERS = {
+    'K': 1_000, 'k': 1_000,
+    'M': 1_000_000, 'm': 1_000_000,
+    'B': 1_000_000_000, 'b': 1_000_000_000,
+    '': 1
+}
+
+# How often pending processed-token additions are flushed to disk (seconds)
+TOKENS_FLUSH_INTERVAL = 30
+
+# Maximum number of resolved Telegram entities kept in memory
+ENTITY_CACHE_SIZE = 1024
+
+# Maximum Telegram requests the listener keeps in flight at once
+RPC_CONCURRENCY = 20
+
+# Forward pacing (token bucket): up to FORWARD_BURST sends at once, then FORWARD_RATE per second
+FORWARD_BURST = 5
+FORWARD_RATE = 1.0
+FORWARD_QUEUE_SIZE = 10_000  # CAs waiting beyond this are dropped rather than buffered forever
+FORWARD_ERROR_LOG_INTERVAL = 5.0  # Seconds before an identical forward error is logged again
+
+# How long a fetched dialog list is reused before hitting Telegram again (seconds)
+DIALOGS_CACHE_TTL = 300
+# Most recent dialogs fetched for the chat picker; older ones are rarely monitored
+DIALOGS_LIMIT = 500
+
+# Interval between health check reports (seconds)
+HEALTH_CHECK_INTERVAL = 3600
+HEALTH_CHECK_JITTER = 60  # Max seconds of random offset per report
+_HEALTH_REPORT = (
+    "Health Check:\n"
+    "* Messages Processed: %d\n"
+    "* Tokens Forwarded: %d\n"
+    "* Unique Tokens: %d\n"
+    "* Uptime: %dh %dm\n"
+    "* Ping: %dms\n"
+    "* Monitoring: %d chats"
 )
 
+# Upper bound on remembered processed tokens; oldest entries are evicted first
+MAX_PROCESSED_TOKENS = 100_000
+
 # Bot Configuration
 PRIMARY_BOT = {
     'username': 'odysseus_trojanbot',
     'ref': 'r-forza222'
 }
+REFERRAL_URL = f"https://t.me/{PRIMARY_BOT['username']}?start={PRIMARY_BOT['ref']}"
 
-# Load environment variables
-load_dotenv(ENV_FILE)
+# Load environment variables once into a plain dict; real environment
+# variables still take precedence over the .env file
+ENV = {**dotenv_values(ENV_FILE), **os.environ}
 try:
-    api_id = os.getenv('API_ID')
+    api_id = ENV.get('API_ID')
     if not api_id:
         raise ValueError("API_ID environment variable is not set in .env file")
     API_ID = int(api_id)
     
-    API_HASH = os.getenv('API_HASH')
+    API_HASH = ENV.get('API_HASH')
     if not API_HASH:
         raise ValueError("API_HASH environment variable is not set in .env file")
         
-    TARGET_CHAT = os.getenv('TARGET_CHAT')
+    TARGET_CHAT = ENV.get('TARGET_CHAT')
     if not TARGET_CHAT:
         raise ValueError("TARGET_CHAT environment variable is not set in .env file")
     # Clean up target chat value
     TARGET_CHAT = TARGET_CHAT.lstrip('@').strip()  # Remove @ prefix and whitespace
     
     # Get tracking chat for notifications
-    TRACKING_CHAT = os.getenv('TRACKING_CHAT', 'me')  # Default to 'me' if not set
+    TRACKING_CHAT = ENV.get('TRACKING_CHAT') or 'me'  # Default to 'me' if not set
     TRACKING_CHAT = TRACKING_CHAT.lstrip('@').strip()  # Clean up tracking chat value
 except (ValueError, TypeError) as e:
     print("\n❌ Error with environment variables:")
@@ -98,32 +195,44 @@ except (ValueError, TypeError) as e:
 class SimpleSolListener:
     """Telegram bot for monitoring and forwarding Solana contract addresses"""
     
-    def __init__(self, client):
-        """Initialize the SimpleSolListener"""
-        load_dotenv()
-        
+    def __init__(self, client, token_tracker: TokenTracker = None):
+        """Initialize the SimpleSolListener, reusing token_tracker (and its HTTP session) if given"""
         self.client = client  # NEW: store the passed-in client
         self.config = {}
+        self._saved_config = None  # JSON bytes of the last config write, to skip no-op saves
         self.source_chats = []
+        self._source_chat_keys = frozenset()  # Normalized int IDs of source_chats, set when monitoring starts
         self.filtered_users = {}
-        self.processed_tokens = set()
+        self.processed_tokens = OrderedDict()  # lowercased CA -> original CA, oldest first
+        self._tokens_dirty = False  # True when processed_tokens has unsaved additions
+        self._tokens_log = None  # Append handle for TOKENS_LOG_FILE, opened on first add
+        self._tokens_logged = 0  # Entries in TOKENS_LOG_FILE not yet folded into a snapshot
         self.forwarded_count = 0
         self.show_detailed_feed = False
         self.dialogs_cache = {}
+        self._dialogs = None  # Last fetched dialog list
+        self._dialogs_fetched_at = 0.0  # time.monotonic() of the last dialog fetch
+        self._entity_cache = OrderedDict()  # entity id -> resolved Telethon entity, LRU order
+        self._health_task = None  # Strong reference to the running health monitor
+        self._rpc_sem = asyncio.Semaphore(RPC_CONCURRENCY)  # Shared by concurrent get_entity/send_message calls
+        self._forward_queue = asyncio.Queue(maxsize=FORWARD_QUEUE_SIZE)  # CAs waiting to be sent to the target chat
+        self._forward_error_logged = {}  # Error text -> monotonic time it was last logged
         
         # Track startup time and how many messages we've processed
-        self.start_time = time.time()     # NEW
+        self.start_time = time.monotonic()  # Monotonic, so uptime survives clock changes
         self.processed_count = 0          # NEW
 
         # Get target chat from environment
-        self.target_chat = os.getenv('TARGET_CHAT')
+        self.target_chat = ENV.get('TARGET_CHAT')
         if not self.target_chat:
             logging.error("TARGET_CHAT not set in environment variables")
             raise ValueError("TARGET_CHAT environment variable is required")
             
         # Initialize token tracker
-        tracking_chat = os.getenv('TRACKING_CHAT', 'me')
-        self.token_tracker = TokenTracker(self.client, tracking_chat)
+        if token_tracker is None:
+            tracking_chat = ENV.get('TRACKING_CHAT') or 'me'
+            token_tracker = TokenTracker(self.client, tracking_chat, target_chat=self.target_chat)
+        self.token_tracker = token_tracker
         
         # Create required files
         self._initialize_config_files()
@@ -157,47 +266,73 @@ class SimpleSolListener:
         
     def _initialize_config_files(self):
         """Initialize required configuration files if they don't exist"""
-        # Config file
-        if not os.path.exists(CONFIG_FILE):
-            print("✨ Creating new configuration file...")
-            initial_config = {
-                'source_chats': [],
-                'filtered_users': {},
-                'session_string': None,
-                'verified': False,
-                'blacklisted_keywords': []
-            }
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(initial_config, f, indent=4)
+        # Config file -- exclusive create skips a separate exists() check
+        try:
+            with open(CONFIG_FILE, 'xb') as f:
+                print("✨ Creating new configuration file...")
+                initial_config = {
+                    'source_chats': [],
+                    'filtered_users': {},
+                    'session_string': None,
+                    'verified': False,
+                    'blacklisted_keywords': []
+                }
+                f.write(orjson.dumps(initial_config, option=orjson.OPT_INDENT_2))
             print("✓ sol_listener_config.json")
-        else:
+        except FileExistsError:
             print("✓ sol_listener_config.json (existing)")
             
         # Processed tokens file
-        tokens_file = BASE_DIR / 'processed_tokens.json'
-        if not os.path.exists(tokens_file):
-            print("✨ Creating processed tokens file...")
-            with open(tokens_file, 'w') as f:
-                json.dump([], f)
+        try:
+            with open(TOKENS_FILE, 'xb') as f:
+                print("✨ Creating processed tokens file...")
+                f.write(orjson.dumps([]))
             print("✓ processed_tokens.json")
-        else:
+        except FileExistsError:
             print("✓ processed_tokens.json (existing)")
             
         # Environment file check
-        if not os.path.exists(ENV_FILE):
-            print("❌ No .env file found!")
-            print("Creating template .env file...")
-            with open(ENV_FILE, 'w') as f:
+        try:
+            with open(ENV_FILE, 'x') as f:
+                print("❌ No .env file found!")
+                print("Creating template .env file...")
                 f.write("""API_ID=
 API_HASH=
 TARGET_CHAT=
 TRACKING_CHAT=me
 DEBUG=false
 """)
+        except FileExistsError:
+            print("✓ .env file found")
+        else:
             print("⚠️ Please fill in your credentials in the .env file")
             return False
+
+    async def _get_entity(self, entity_id):
+        """Resolve a Telegram entity, caching it since titles/usernames rarely change"""
+        entity = self._entity_cache.get(entity_id)
+        if entity is None:
+            async with self._rpc_sem:
+                entity = await self.client.get_entity(entity_id)
+            self._entity_cache[entity_id] = entity
+            if len(self._entity_cache) > ENTITY_CACHE_SIZE:
+                self._entity_cache.popitem(last=False)
         else:
-            print("✓ .env file found")
+            self._entity_cache.move_to_end(entity_id)
+        return entity
+
+    async def get_chat_names(self, chat_ids) -> List:
+        """Resolve chat titles concurrently; None marks chats that could not be resolved"""
+        async def get_name(chat_id):
+            # Never raises, so one bad chat can't make gather discard the whole batch
+            try:
+                entity = await self._get_entity(int(chat_id))
+                return getattr(entity, 'title', str(chat_id))
+            except Exception as e:
+                # Display-only lookup: any failure falls back to the "Chat {id}" label
+                logging.debug("Could not resolve chat %s: %s", chat_id, e)
+                return None
+        return await asyncio.gather(*(get_name(chat_id) for chat_id in chat_ids))
 
     def normalize_chat_id(self, chat_id) -> str:
         """Normalize chat ID to consistent format"""
@@ -212,26 +347,32 @@ DEBUG=false
         
         return chat_id_str
 
-    def normalize_user_id(self, user_id) -> str:
+    def chat_key(self, chat_id) -> int:
+        """Normalize chat ID to the int key used by filtered_users"""
+        return int(self.normalize_chat_id(chat_id))
+
+    def normalize_user_id(self, user_id) -> int:
         """Normalize user ID to consistent format"""
-        return str(abs(int(user_id)))
+        return abs(int(user_id))
 
     def load_config(self) -> dict:
         """Load configuration from file"""
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-                    # Normalize all IDs in filtered_users
-                    normalized_filters = {}
-                    for chat_id, users in config.get('filtered_users', {}).items():
-                        normalized_chat_id = self.normalize_chat_id(chat_id)
-                        normalized_filters[normalized_chat_id] = [self.normalize_user_id(uid) for uid in users]
-                    self.filtered_users = normalized_filters
-                    logging.info(f"Loaded filtered users: {self.filtered_users}")
-                    return config
-            except Exception as e:
-                logging.error(f"Error loading config: {str(e)}")
+        try:
+            with open(CONFIG_FILE, 'rb') as f:
+                config = orjson.loads(f.read())
+                # Normalize all IDs in filtered_users; chat keys are held as ints
+                # in memory (OPT_NON_STR_KEYS writes them back out as strings) and each
+                # allow-list as a frozenset for O(1) sender checks
+                normalized_filters = {}
+                for chat_id, users in config.get('filtered_users', {}).items():
+                    normalized_filters[self.chat_key(chat_id)] = frozenset(self.normalize_user_id(uid) for uid in users)
+                self.filtered_users = normalized_filters
+                logging.info("Loaded filtered users: %s", self.filtered_users)
+                return config
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error("Error loading config: %s", e)
         return {
             'source_chats': [],
             'filtered_users': {},
@@ -244,53 +385,42 @@ DEBUG=false
             if not self.config.get('session_string'):
                 self.config['session_string'] = self.client.session.save()
             self.config['source_chats'] = self.source_chats
-            self.config['filtered_users'] = self.filtered_users
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            self.config['filtered_users'] = {
+                chat_id: sorted(users) for chat_id, users in self.filtered_users.items()
+            }
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            if data == self._saved_config:
+                return  # Nothing changed since the last save
+            _atomic_write(CONFIG_FILE, data)
+            self._saved_config = data
             logging.info("Configuration saved successfully")
-            logging.info(f"Filtered users: {self.filtered_users}")
+            logging.info("Filtered users: %s", self.config['filtered_users'])
         except Exception as e:
-            logging.error(f"Error saving config: {str(e)}")
+            logging.error("Error saving config: %s", e)
 
-    async def extract_ca_from_text(self, text: str) -> str:
-        """Extract Solana CA from text with improved validation"""
-        if not text:
+    def extract_ca_from_text(self, text: str) -> str:
+        """Extract Solana CA from text (explorer links take priority over raw addresses)"""
+        # A CA is at least 32 chars, so shorter messages can't contain one
+        if not text or len(text) < 32:
             return None
 
-        logging.info(f"Checking text for CA: {text[:200]}...")  # Limit log length
-
-        # Updated regex patterns for better matching
-        link_patterns = [
-            r'(?:dexscreener\.com/solana|birdeye\.so/token|solscan\.io/token|jup\.ag/swap/[^-]+-|pump\.fun/coin|gmgn\.ai/sol/token)/([1-9A-HJ-NP-Za-km-z]{32,44})',
-            r'\b([1-9A-HJ-NP-Za-km-z]{32,44})\b'  # Raw CA as fallback
-        ]
+        # Runs per message; skip building log strings when INFO is filtered out
+        log_info = logging.root.isEnabledFor(logging.INFO)
+        if log_info:
+            logging.info("Checking text for CA: %s...", text[:200])  # Limit log length
 
-        found_ca = None
-        for pattern in link_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                ca = match.group(1)
-                
-                # Basic CA validation
-                if not ca or len(ca) < 32 or len(ca) > 44:
-                    continue
-                    
-                # Check for invalid characters
-                if not re.match(r'^[1-9A-HJ-NP-Za-km-z]+$', ca):
-                    continue
-
-                if found_ca and found_ca.lower() != ca.lower():
-                    logging.warning(f"Multiple distinct CAs found: {found_ca} vs {ca}")
-                    continue
-
-                found_ca = ca
-                logging.info(f"Found valid CA: {found_ca}")
-                break
-
-            if found_ca:
-                break
+        # Patterns only match base58 runs of 32-44 chars, so no extra validation is needed
+        for required, pattern in _CA_PATTERNS:
+            if required not in text:
+                continue
+            match = pattern.search(text)
+            if match:
+                found_ca = match.group(1)
+                if log_info:
+                    logging.info("Found valid CA: %s", found_ca)
+                return found_ca
 
-        return found_ca
+        return None
 
     async def process_message_content(self, message) -> tuple[str, str]:
         """Process different types of message content"""
@@ -299,10 +429,10 @@ DEBUG=false
         
         try:
             if message.message:  # Text message
-                ca = await self.extract_ca_from_text(message.message)
+                ca = self.extract_ca_from_text(message.message)
         
         except Exception as e:
-            logging.error(f"Error processing message content: {str(e)}")
+            logging.error("Error processing message content: %s", e)
         
         return content_type, ca
 
@@ -310,26 +440,31 @@ DEBUG=false
         """Display menu for selecting multiple chats"""
         print("\n🔍 Loading your chats and channels...\n")
         dialogs = await self.get_dialogs()
+        dialogs_by_id = {d['id']: d for d in dialogs}
         
-        print("📋 Available Chats and Channels:")
-        print("=" * 50)
-        print(f"{'Index':<6} {'Type':<10} {'Name':<30} {'ID':<15}")
-        print("-" * 61)
-        
+        # Build the whole listing and write it once; large dialog lists would
+        # otherwise cost a console write per row
+        lines = [
+            "📋 Available Chats and Channels:",
+            "=" * 50,
+            f"{'Index':<6} {'Type':<10} {'Name':<30} {'ID':<15}",
+            "-" * 61,
+        ]
         for i, dialog in enumerate(dialogs):
-            print(f"{i:<6} {dialog['type']:<10} {dialog['name'][:30]:<30} {dialog['id']:<15}")
-        
-        print("\n" + "=" * 50)
-        print("Enter chat indices separated by commas (e.g., 1,3,5)")
+            lines.append(f"{i:<6} {dialog['type']:<10} {dialog['name'][:30]:<30} {dialog['id']:<15}")
+        lines.append("\n" + "=" * 50)
+        lines.append("Enter chat indices separated by commas (e.g., 1,3,5)")
+        print("\n".join(lines))
         
         selected_chats = []
+        selected_ids = set()  # Mirrors selected_chats for O(1) duplicate checks
         while True:
             choice = input("\n🎯 Select chats to monitor (or 'q' to finish): ").strip()
             if choice.lower() == 'q':
                 if selected_chats:  # If we have selections, confirm and exit
                     print("\nSelected chats:")
                     for chat_id in selected_chats:
-                        dialog = next((d for d in dialogs if d['id'] == chat_id), None)
+                        dialog = dialogs_by_id.get(chat_id)
                         if dialog:
                             print(f"✅ {dialog['name']}")
                     
@@ -338,6 +473,7 @@ DEBUG=false
                         break
                     else:
                         selected_chats = []  # Reset selections if not confirmed
+                        selected_ids.clear()
                         continue
                 else:
                     print("❌ No chats selected")
@@ -350,7 +486,8 @@ DEBUG=false
                 for idx in indices:
                     if 0 <= idx < len(dialogs):
                         chat_id = dialogs[idx]['id']
-                        if chat_id not in selected_chats:
+                        if chat_id not in selected_ids:
+                            selected_ids.add(chat_id)
                             selected_chats.append(chat_id)
                             print(f"✅ Added: {dialogs[idx]['name']}")
                             new_selections = True
@@ -360,7 +497,7 @@ DEBUG=false
                 if new_selections:
                     print("\nCurrent selections:")
                     for chat_id in selected_chats:
-                        dialog = next((d for d in dialogs if d['id'] == chat_id), None)
+                        dialog = dialogs_by_id.get(chat_id)
                         if dialog:
                             print(f"• {dialog['name']}")
                     print("\nEnter more indices or 'q' to finish")
@@ -390,33 +527,40 @@ DEBUG=false
                     print("❌ No users found in the channel")
                     return None
                 
-                print("\n All Users:")
-                print("=" * 50)
                 users_list = sorted(list(users), key=lambda x: x[1].lower())  # Sort by username
+                lines = ["\n All Users:", "=" * 50]
                 for i, (user_id, username) in enumerate(users_list):
-                    print(f"{i:<3} | {username:<30} | {user_id}")
-                
-                print("\n📝 User Selection:")
-                print("--------------------------------------------------")
-                print("• Enter the numbers of users you want to monitor")
-                print("• Separate multiple numbers with commas (e.g., 0,2,5)")
-                print("• Type 'q' when you're done selecting")
-                print("Example: '0,3,7' to monitor users with index 0, 3, and 7")
+                    lines.append(f"{i:<3} | {username:<30} | {user_id}")
+                lines += [
+                    "\n📝 User Selection:",
+                    "--------------------------------------------------",
+                    "• Enter the numbers of users you want to monitor",
+                    "• Separate multiple numbers with commas (e.g., 0,2,5)",
+                    "• Type 'q' when you're done selecting",
+                    "Example: '0,3,7' to monitor users with index 0, 3, and 7",
+                ]
+                print("\n".join(lines))
                 
                 selected_users = []
+                selected_ids = set()  # Mirrors selected_users for O(1) duplicate checks
                 while True:
                     choice = input("\n👥 Select users to monitor (or 'q' to finish): ")
                     if choice.lower() == 'q':
                         break
                     
                     try:
-                        indices = [int(x.strip()) for x in choice.split(',')]
+                        # Accept commas and/or whitespace so long pasted lists parse in one go
+                        indices = [int(x) for x in choice.replace(',', ' ').split()]
+                        added = []
                         for idx in indices:
                             if 0 <= idx < len(users_list):
                                 user_id, username = users_list[idx]
-                                if user_id not in selected_users:  # Avoid duplicates
+                                if user_id not in selected_ids:  # Avoid duplicates
+                                    selected_ids.add(user_id)
                                     selected_users.append(user_id)
-                                    print(f"✅ Added: {username} (ID: {user_id})")
+                                    added.append(f"✅ Added: {username} (ID: {user_id})")
+                        if added:
+                            print("\n".join(added))
                     except ValueError:
                         print("❌ Please enter valid numbers")
                 
@@ -428,7 +572,7 @@ DEBUG=false
                     return None
                 
             except Exception as e:
-                logging.error(f"Error loading users: {e}")
+                logging.error("Error loading users: %s", e)
                 print(f"\n❌ Error: {str(e)}")
                 return None
         
@@ -450,17 +594,17 @@ DEBUG=false
                 try:
                     chat_count = len(self.source_chats)
                     chat_names = []
-                    for chat_id in self.source_chats[:3]:  # Show first 3 chats
-                        try:
-                            entity = await self.client.get_entity(int(chat_id))
-                            chat_name = entity.title if hasattr(entity, 'title') else str(chat_id)
-                            if str(chat_id) in self.filtered_users:
-                                user_count = len(self.filtered_users[str(chat_id)])
-                                chat_names.append(f"{chat_name} ({user_count} users)")
-                            else:
-                                chat_names.append(f"{chat_name} (all users)")
-                        except:
+                    first_chats = self.source_chats[:3]  # Show first 3 chats
+                    for chat_id, chat_name in zip(first_chats, await self.get_chat_names(first_chats)):
+                        if chat_name is None:
                             chat_names.append(f"Chat {chat_id}")
+                            continue
+                        filter_list = self.filtered_users.get(self.chat_key(chat_id))
+                        if filter_list is not None:
+                            user_count = len(filter_list)
+                            chat_names.append(f"{chat_name} ({user_count} users)")
+                        else:
+                            chat_names.append(f"{chat_name} (all users)")
                     
                     if chat_count > 3:
                         chat_info = f"{chat_count} chats configured: {', '.join(chat_names[:3])} +{chat_count - 3} more"
@@ -468,7 +612,7 @@ DEBUG=false
                         chat_info = f"{chat_count} chats configured: {', '.join(chat_names)}"
                 except Exception as e:
                     chat_info = f"{len(self.source_chats)} chats configured"
-                    logging.error(f"Error getting chat names: {e}")
+                    logging.error("Error getting chat names: %s", e)
             
             print("\n🔧 Main Menu")
             print("=" * 50)
@@ -490,17 +634,17 @@ DEBUG=false
                         print("=" * 50)
                         
                         # Show chat configurations
-                        for chat_id in self.source_chats:
-                            try:
-                                entity = await self.client.get_entity(int(chat_id))
-                                chat_name = entity.title if hasattr(entity, 'title') else str(chat_id)
-                                if str(chat_id) in self.filtered_users:
-                                    user_count = len(self.filtered_users[str(chat_id)])
-                                    print(f"✓ {chat_name}: Monitoring {user_count} specific users")
-                                else:
-                                    print(f"✓ {chat_name}: Monitoring all users")
-                            except:
+                        chat_names = await self.get_chat_names(self.source_chats)
+                        for chat_id, chat_name in zip(self.source_chats, chat_names):
+                            if chat_name is None:
                                 print(f"✓ Chat {chat_id}: Configuration loaded")
+                                continue
+                            filter_list = self.filtered_users.get(self.chat_key(chat_id))
+                            if filter_list is not None:
+                                user_count = len(filter_list)
+                                print(f"✓ {chat_name}: Monitoring {user_count} specific users")
+                            else:
+                                print(f"✓ {chat_name}: Monitoring all users")
                         
                         print("\n🎯 Starting monitoring with these settings...")
                         await self.start_monitoring()
@@ -591,6 +735,15 @@ DEBUG=false
         # Start command listener in separate task
         command_task = asyncio.create_task(self.handle_commands())
         
+        # Bind what the handler needs once; source chats don't change while monitoring
+        source_chat_ids = frozenset(abs(x) for x in self.source_chats)
+        self._source_chat_keys = frozenset(self.chat_key(x) for x in self.source_chats)
+        handle_source = self.handle_source_message
+        handle_target = self.handle_target_message
+        # TARGET_CHAT is either a numeric chat ID or a username; resolve which once
+        target_id = int(TARGET_CHAT) if TARGET_CHAT.isdigit() else None
+        target_username = TARGET_CHAT.lstrip('@')
+        
         # Register message handler
         @self.client.on(events.NewMessage())
         async def message_handler(event):
@@ -598,32 +751,41 @@ DEBUG=false
                 event_chat_id = abs(event.chat_id)
                 
                 # If it's a source chat message
-                if event_chat_id in [abs(x) for x in self.source_chats]:
-                    await self.handle_source_message(event)
+                if event_chat_id in source_chat_ids:
+                    await handle_source(event)
                 # If it's the target chat
-                elif (str(event_chat_id) == str(TARGET_CHAT) if str(TARGET_CHAT).isdigit() 
-                      else event.chat.username == TARGET_CHAT.lstrip('@')):
-                    await self.handle_target_message(event)
+                elif (event_chat_id == target_id if target_id is not None
+                      else event.chat.username == target_username):
+                    await handle_target(event)
                     
             except Exception as e:
-                logging.error(f"Error in message handler: {str(e)}")
+                logging.error("Error in message handler: %s", e)
                 # Continue running even if there's an error
         
-        # Start health monitoring in background
-        health_task = asyncio.create_task(self.monitor_health())
+        # Start health monitoring and reconnect handling in background
+        self._health_task = asyncio.create_task(self.monitor_health(), name="health")
+        connection_task = asyncio.create_task(self.watch_connection())
+        
+        # Flush processed tokens to disk in the background
+        flush_task = asyncio.create_task(self.flush_processed_tokens())
+        
+        # Send detected CAs to the target chat
+        forward_task = asyncio.create_task(self.forward_worker())
         
         try:
             # Wait for command task to complete (when user types 'stop')
             await command_task
         finally:
             # Cleanup
-            token_tracker_task.cancel()
-            health_task.cancel()
-            try:
-                await token_tracker_task
-                await health_task
-            except asyncio.CancelledError:
-                pass
+            background_tasks = (token_tracker_task, self._health_task, connection_task, flush_task, forward_task)
+            for task in background_tasks:
+                task.cancel()
+            # Wait for every task to finish, even if an earlier one raises
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+            self._health_task = None
+            
+            # Persist anything added since the last flush
+            await self.save_if_dirty_async()
 
     async def handle_commands(self):
         """Handle user commands in separate task"""
@@ -653,71 +815,79 @@ DEBUG=false
 
             self.processed_count += 1
             message = event.message
-            if not message.message:
+            text = message.message  # None or empty for media-only posts
+            if not text:
                 return
 
+            # Read the feed toggle once per message rather than on every check
+            show_feed = self.show_detailed_feed
+
+            # Without the detailed feed, messages with no CA need no chat/sender lookups;
+            # text shorter than a CA can't hold one, so skip the extraction call entirely
+            if len(text) < 32:
+                if not show_feed:
+                    return
+                ca = None
+            else:
+                ca = self.extract_ca_from_text(text)
+                if not ca and not show_feed:
+                    return
+
             try:
                 chat = await message.get_chat()
                 sender = await message.get_sender()
                 if not chat or not sender:
                     return
             except Exception as e:
-                logging.error(f"Error getting chat/sender info: {str(e)}")
+                logging.error("Error getting chat/sender info: %s", e)
                 return
 
-            # Normalize chat ID consistently
-            chat_id = self.normalize_chat_id(str(chat.id))
-            sender_id = str(abs(sender.id))
+            # Entity IDs are already unmarked ints, matching the chat_key() form
+            chat_id = chat.id
+            sender_id = abs(sender.id)
 
             # First check if chat should be monitored
-            if chat_id not in [self.normalize_chat_id(str(x)) for x in self.source_chats]:
-                if self.show_detailed_feed:
+            if chat_id not in self._source_chat_keys:
+                if show_feed:
                     print(f"ℹ️ Chat {chat.title} ({chat_id}) not in monitored chats")
                 return
 
             # Show message details for all messages from monitored chats
-            if self.show_detailed_feed:
+            if show_feed:
                 # Get sender name safely - use first_name, last_name, or ID if username not available
                 sender_name = getattr(sender, 'username', None) or getattr(sender, 'first_name', None) or getattr(sender, 'last_name', None) or str(sender_id)
                 print(f"\n📨 Message from: {chat.title}")
                 print(f"👤 Sender: {sender_name} ({sender_id})")
                 print(f"💭 Chat ID: {chat_id}")
-                print(f"📝 Message: {message.message}")
+                print(f"📝 Message: {text}")
 
             # Then check user filter for processing
-            if chat_id in self.filtered_users:
-                filter_list = [str(uid) for uid in self.filtered_users[chat_id]]
+            filter_list = self.filtered_users.get(chat_id)
+            if filter_list is not None:
                 if sender_id not in filter_list:
-                    if self.show_detailed_feed:
+                    if show_feed:
                         print(f"ℹ️ Message skipped: Sender not in filter list")
                     return
 
-            # Process message content
-            ca = await self.extract_ca_from_text(message.message)
             if not ca:
-                if self.show_detailed_feed:
+                if show_feed:
                     print("ℹ️ No contract address found")
                 return
 
             # Check for already processed tokens
-            if ca.lower() in {t.lower() for t in self.processed_tokens}:
-                if self.show_detailed_feed:
+            if ca.lower() in self.processed_tokens:
+                if show_feed:
                     print(f"ℹ️ Token {ca} already processed")
                 return
 
-            # Forward to target chat
+            # Queue for the forward worker, which paces sends to the target chat
             try:
-                await self.forward_message(ca)
-                self.processed_tokens.add(ca)
-                self.save_processed_tokens()
-                self.forwarded_count += 1
-                if self.show_detailed_feed:
-                    print(f"✅ Forwarded {ca} to target chat")
-            except Exception as e:
-                logging.error(f"Error forwarding message: {str(e)}")
+                self._forward_queue.put_nowait(ca)
+            except asyncio.QueueFull:
+                logging.warning("Forward queue full, dropping %s", ca)
 
         except Exception as e:
-            logging.error(f"Error in handle_source_message: {str(e)}")
+            logging.error("Error in handle_source_message: %s", e)
 
     async def handle_target_message(self, event):
         """Process messages from target chat with improved token tracking"""
@@ -730,12 +900,12 @@ DEBUG=false
 
             # Track new tokens
             if "buy $" in text:
-                ca = await self.extract_ca_from_text(message.message)
+                ca = self.extract_ca_from_text(message.message)
                 initial_mcap = await self.extract_mcap_from_message(message.message)
                 
                 if ca and initial_mcap:
                     # Extract token name with improved regex
-                    name_match = re.search(r'buy \$([a-zA-Z0-9_]+)', text, re.IGNORECASE)
+                    name_match = _BUY_NAME_RE.search(text)
                     if name_match:
                         token_name = name_match.group(1)
                         # Add validation for token name
@@ -748,14 +918,14 @@ DEBUG=false
             # Handle sell messages with improved detection
             sell_phrases = ["sell $", "sold $", "selling $", "exit $", "closed $", "🟢 sell success"]
             if any(phrase in text for phrase in sell_phrases):
-                ca = await self.extract_ca_from_text(message.message)
+                ca = self.extract_ca_from_text(message.message)
                 if ca:
                     if self.show_detailed_feed:
                         print(f"🔍 Sell signal for: {ca}")
                     await self.token_tracker.handle_sell_message(message.message, ca)
 
         except Exception as e:
-            logging.error(f"Error in handle_target_message: {str(e)}")
+            logging.error("Error in handle_target_message: %s", e)
             logging.exception("Full traceback:")
 
     async def extract_mcap_from_message(self, text: str) -> float:
@@ -763,27 +933,15 @@ DEBUG=false
         if not text:
             return None
 
-        # Enhanced pattern matching for various formats
-        mcap_patterns = [
-            r'MC:\s*\$?([\d,]+\.?\d*)([KMBkmb]?)',  # Standard format
-            r'Market Cap:?\s*\$?([\d,]+\.?\d*)([KMBkmb]?)',  # Alternative format
-            r'MCap:?\s*\$?([\d,]+\.?\d*)([KMBkmb]?)'  # Short format
-        ]
-
-        for pattern in mcap_patterns:
-            match = re.search(pattern, text)
+        for pattern in _MCAP_PATTERNS:
+            match = pattern.search(text)
             if match:
                 try:
                     # Clean and convert value
                     value = float(match.group(1).replace(',', ''))
                     
                     # Normalize multiplier
-                    multiplier = {
-                        'K': 1_000, 'k': 1_000,
-                        'M': 1_000_000, 'm': 1_000_000,
-                        'B': 1_000_000_000, 'b': 1_000_000_000,
-                        '': 1
-                    }.get(match.group(2), 1)
+                    multiplier = _MCAP_MULTIPLIERS.get(match.group(2), 1)
 
                     mcap = value * multiplier
                     
@@ -794,7 +952,7 @@ DEBUG=false
                     return mcap
 
                 except (ValueError, TypeError) as e:
-                    logging.error(f"Error parsing market cap: {str(e)}")
+                    logging.error("Error parsing market cap: %s", e)
                     continue
 
         return None
@@ -820,6 +978,7 @@ DEBUG=false
             print("Enter chat indices separated by commas (e.g., 1,3,5)")
             
             selected_chats = []
+            selected_ids = set()  # Mirrors selected_chats for O(1) duplicate checks
             while True:
                 choice = input("\n🎯 Select chats to monitor (or 'q' to finish): ").strip()
                 if choice.lower() == 'q':
@@ -831,7 +990,8 @@ DEBUG=false
                         if 0 <= idx < len(dialogs):
                             raw_id = dialogs[idx]['id']
                             chat_id = abs(raw_id)  # NEW: store absolute value
-                            if chat_id not in selected_chats:
+                            if chat_id not in selected_ids:
+                                selected_ids.add(chat_id)
                                 selected_chats.append(chat_id)
                                 print(f"✅ Added: {dialogs[idx]['name']}")
                         else:
@@ -860,17 +1020,17 @@ DEBUG=false
         
         if self.source_chats:
             print(f"\nMonitored Chats: {len(self.source_chats)}")
-            for chat_id in self.source_chats:
-                try:
-                    entity = await self.client.get_entity(int(chat_id))
-                    chat_name = entity.title if hasattr(entity, 'title') else str(chat_id)
-                    if str(chat_id) in self.filtered_users:
-                        user_count = len(self.filtered_users[str(chat_id)])
-                        print(f"✓ {chat_name}: Monitoring {user_count} specific users")
-                    else:
-                        print(f"✓ {chat_name}: Monitoring all users")
-                except:
+            chat_names = await self.get_chat_names(self.source_chats)
+            for chat_id, chat_name in zip(self.source_chats, chat_names):
+                if chat_name is None:
                     print(f"✓ Chat {chat_id}: Configuration saved")
+                    continue
+                filter_list = self.filtered_users.get(self.chat_key(chat_id))
+                if filter_list is not None:
+                    user_count = len(filter_list)
+                    print(f"✓ {chat_name}: Monitoring {user_count} specific users")
+                else:
+                    print(f"✓ {chat_name}: Monitoring all users")
         else:
             print("\nNo channels configured")
             
@@ -1000,7 +1160,7 @@ DEBUG=false
             for keyword in whitelisted_keywords:
                 if keyword in message_text:
                     whitelist_match = True
-                    logging.info(f"✅ Message matched whitelist keyword: {keyword}")
+                    logging.info("✅ Message matched whitelist keyword: %s", keyword)
                     break
             if not whitelist_match:
                 logging.info("❌ Message did not match any whitelist keywords")
@@ -1011,129 +1171,325 @@ DEBUG=false
         # Then check blacklist
         for keyword in blacklisted_keywords:
             if keyword in message_text:
-                logging.info(f"❌ Message contains blacklisted keyword: {keyword}")
+                logging.info("❌ Message contains blacklisted keyword: %s", keyword)
                 return False
                 
         return True
 
     async def forward_message(self, ca: str):
         """Forward contract address to target chat"""
+        # Errors are raised, not logged; the forward worker logs them with rate limiting
         if not self.target_chat:
-            error_msg = "TARGET_CHAT not configured"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
+            raise ValueError("TARGET_CHAT not configured")
             
         if not self.client:
-            error_msg = "Telegram client not initialized"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
+            raise ValueError("Telegram client not initialized")
             
         try:
             # Get target entity
             try:
-                target_entity = await self.client.get_entity(self.target_chat)
+                target_entity = await self._get_entity(self.target_chat)
             except ValueError as e:
-                error_msg = f"Invalid TARGET_CHAT value: {self.target_chat}. Error: {str(e)}"
-                logging.error(error_msg)
-                raise ValueError(error_msg)
+                raise ValueError(f"Invalid TARGET_CHAT value: {self.target_chat}. Error: {str(e)}")
                 
             # Send message
-            await self.client.send_message(
-                target_entity,
-                ca  # Send original case
-            )
-            logging.info(f"Successfully forwarded {ca} to target chat {self.target_chat}")
+            async with self._rpc_sem:
+                await self.client.send_message(
+                    target_entity,
+                    ca  # Send original case
+                )
+            logging.info("Successfully forwarded %s to target chat %s", ca, self.target_chat)
             
+        except FloodWaitError:
+            raise  # Let the forward worker honour Telegram's requested wait
         except Exception as e:
-            error_msg = f"Error forwarding message to {self.target_chat}: {str(e)}"
-            logging.error(error_msg)
-            raise ValueError(error_msg)
+            raise ValueError(f"Error forwarding message to {self.target_chat}: {str(e)}")
+
+    async def forward_worker(self):
+        """Send queued CAs to the target chat in small concurrent batches, paced by a token bucket"""
+        loop = asyncio.get_running_loop()
+        queue = self._forward_queue
+        tokens = FORWARD_BURST
+        last_refill = loop.time()
+        while True:
+            # Take whatever is already queued (up to the burst size) along with the next CA
+            batch = [await queue.get()]
+            while len(batch) < FORWARD_BURST and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                # The same CA may have been queued twice before the first send finished
+                pending = []
+                seen = set()  # Lowercased, matching the case-insensitive processed_tokens keys
+                for ca in batch:
+                    key = ca.lower()
+                    if key not in seen and not await self.is_token_processed(ca):
+                        seen.add(key)
+                        pending.append(ca)
+                if not pending:
+                    continue
 
-    async def get_dialogs(self) -> List[Dict]:
-        """Fetch and return all dialogs (chats/channels)"""
+                now = loop.time()
+                tokens = min(FORWARD_BURST, tokens + (now - last_refill) * FORWARD_RATE)
+                last_refill = now
+                if tokens < len(pending):
+                    await asyncio.sleep((len(pending) - tokens) / FORWARD_RATE)
+                    tokens, last_refill = len(pending), loop.time()
+                tokens -= len(pending)
+
+                results = await asyncio.gather(
+                    *(self.forward_message(ca) for ca in pending), return_exceptions=True
+                )
+                flood_wait = 0
+                for ca, result in zip(pending, results):
+                    if isinstance(result, FloodWaitError):
+                        flood_wait = max(flood_wait, result.seconds)
+                        try:
+                            queue.put_nowait(ca)
+                        except asyncio.QueueFull:
+                            logging.warning("Forward queue full, dropping %s", ca)
+                    elif isinstance(result, Exception):
+                        self._log_forward_error(result)
+                    else:
+                        self._mark_token_processed(ca)
+                        self.forwarded_count += 1
+                        if self.show_detailed_feed:
+                            print(f"✅ Forwarded {ca} to target chat")
+                if flood_wait:
+                    logging.warning("Flood wait while forwarding, retrying in %ss", flood_wait)
+                    await asyncio.sleep(flood_wait)
+            except Exception as e:
+                logging.error("Error forwarding message: %s", e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _log_forward_error(self, error: Exception):
+        """Log a forward failure, skipping repeats of the same error within FORWARD_ERROR_LOG_INTERVAL"""
+        key = str(error)
+        now = time.monotonic()
+        if now - self._forward_error_logged.get(key, float('-inf')) < FORWARD_ERROR_LOG_INTERVAL:
+            return
+        if len(self._forward_error_logged) > 1000:
+            self._forward_error_logged.clear()  # Keep the table small if error texts vary
+        self._forward_error_logged[key] = now
+        logging.error("Error forwarding message: %s", error)
+
+    async def get_dialogs(self, refresh: bool = False) -> List[Dict]:
+        """Fetch and return all dialogs (chats/channels), reusing a recent result"""
+        if (not refresh and self._dialogs is not None
+                and time.monotonic() - self._dialogs_fetched_at < DIALOGS_CACHE_TTL):
+            return self._dialogs
+
+        self.dialogs_cache = {}
         dialogs = []
-        async for dialog in self.client.iter_dialogs():
-            if dialog.is_channel or dialog.is_group:  # Only include channels and groups
+        async for dialog in self.client.iter_dialogs(limit=DIALOGS_LIMIT):
+            is_channel = dialog.is_channel
+            if is_channel or dialog.is_group:  # Only include channels and groups
                 self.dialogs_cache[len(dialogs)] = dialog.id
                 dialogs.append({
                     'id': dialog.id,
                     'name': dialog.name,
-                    'type': 'Channel' if dialog.is_channel else 'Group'
+                    'type': 'Channel' if is_channel else 'Group'
                 })
+        self._dialogs = dialogs
+        self._dialogs_fetched_at = time.monotonic()
         return dialogs
 
     def load_processed_tokens(self):
         """Load processed tokens from JSON file"""
-        tokens_file = BASE_DIR / 'processed_tokens.json'
-        if tokens_file.exists():
-            try:
-                with open(tokens_file, 'r') as f:
-                    self.processed_tokens = set(json.load(f))
-                logging.info(f"Loaded {len(self.processed_tokens)} processed tokens")
-            except Exception as e:
-                logging.error(f"Error loading processed tokens: {str(e)}")
-                self.processed_tokens = set()
-        else:
-            self.processed_tokens = set()
+        try:
+            with open(TOKENS_FILE, 'rb') as f:
+                data = f.read()
+            tokens = orjson.loads(data)[-MAX_PROCESSED_TOKENS:]
+            self.processed_tokens = OrderedDict((t.lower(), t) for t in tokens)
+            logging.info("Loaded %d processed tokens", len(self.processed_tokens))
+        except FileNotFoundError:
+            self.processed_tokens = OrderedDict()
+        except Exception as e:
+            logging.error("Error loading processed tokens: %s", e)
+            self.processed_tokens = OrderedDict()
+
+        # Replay tokens appended after the last snapshot was written
+        try:
+            with open(TOKENS_LOG_FILE, 'r', encoding='utf-8') as f:
+                for line in f:
+                    ca = line.strip()
+                    if ca:
+                        self._remember_token(ca)
+                        self._tokens_logged += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.error("Error replaying processed tokens log: %s", e)
+        if self._tokens_logged:
+            self._tokens_dirty = True  # Fold the replayed entries into the next snapshot
 
     def save_processed_tokens(self):
         """Save processed tokens to JSON file"""
+        if self._write_processed_tokens(list(self.processed_tokens.values())):
+            self._tokens_dirty = False
+            self._truncate_tokens_log()
+
+    async def save_processed_tokens_async(self):
+        """Save processed tokens from a worker thread so the event loop isn't blocked"""
+        tokens = list(self.processed_tokens.values())  # Snapshot on the loop thread
+        logged = self._tokens_logged
+        self._tokens_dirty = False
+        try:
+            written = await asyncio.to_thread(self._write_processed_tokens, tokens)
+        except BaseException:
+            self._tokens_dirty = True  # Cancelled mid-write; leave it for the final save
+            raise
+        if not written:
+            self._tokens_dirty = True
+        elif self._tokens_logged == logged:
+            # Only drop the log if nothing was appended while the snapshot was written
+            self._truncate_tokens_log()
+
+    def save_if_dirty(self):
+        """Save processed tokens only if tokens were added since the last save"""
+        if self._tokens_dirty:
+            self.save_processed_tokens()
+
+    async def save_if_dirty_async(self):
+        """Async counterpart of save_if_dirty, writing from a worker thread"""
+        if self._tokens_dirty:
+            await self.save_processed_tokens_async()
+
+    def _append_tokens_log(self, contract_address: str):
+        """Durably record a single new token without rewriting the snapshot"""
         try:
-            tokens_file = BASE_DIR / 'processed_tokens.json'
-            with open(tokens_file, 'w') as f:
-                json.dump(list(self.processed_tokens), f, indent=4)
-            logging.info(f"Saved {len(self.processed_tokens)} processed tokens")
+            if self._tokens_log is None:
+                self._tokens_log = open(TOKENS_LOG_FILE, 'a', encoding='utf-8', buffering=1)
+            self._tokens_log.write(contract_address + '\n')
+            self._tokens_logged += 1
+        except OSError as e:
+            logging.error("Error appending to processed tokens log: %s", e)
+
+    def _truncate_tokens_log(self):
+        """Empty the append log once its entries are covered by a snapshot"""
+        try:
+            if self._tokens_log is not None:
+                self._tokens_log.truncate(0)
+            else:
+                TOKENS_LOG_FILE.unlink(missing_ok=True)
+            self._tokens_logged = 0
+        except OSError as e:
+            logging.error("Error truncating processed tokens log: %s", e)
+
+    def close_tokens_log(self):
+        """Close the append log handle"""
+        if self._tokens_log is not None:
+            self._tokens_log.close()
+            self._tokens_log = None
+
+    def _write_processed_tokens(self, tokens: list) -> bool:
+        """Write a snapshot of processed tokens to disk, returning True on success"""
+        try:
+            data = orjson.dumps(tokens)
+            _atomic_write(TOKENS_FILE, data)
+            logging.info("Saved %d processed tokens", len(tokens))
+            return True
         except Exception as e:
-            logging.error(f"Error saving processed tokens: {str(e)}")
+            logging.error("Error saving processed tokens: %s", e)
+            return False
+
+    async def flush_processed_tokens(self):
+        """Periodically persist processed tokens instead of rewriting the file on every hit"""
+        while True:
+            await asyncio.sleep(TOKENS_FLUSH_INTERVAL)
+            await self.save_if_dirty_async()
 
     async def is_token_processed(self, contract_address: str) -> bool:
         """Check if token was already processed (case-insensitive)"""
-        return contract_address.lower() in {t.lower() for t in self.processed_tokens}
+        return contract_address.lower() in self.processed_tokens
+
+    def _remember_token(self, contract_address: str):
+        """Insert a token into the in-memory LRU, evicting the oldest once the cap is reached"""
+        key = contract_address.lower()
+        self.processed_tokens[key] = contract_address
+        self.processed_tokens.move_to_end(key)
+        if len(self.processed_tokens) > MAX_PROCESSED_TOKENS:
+            self.processed_tokens.popitem(last=False)
+
+    def _mark_token_processed(self, contract_address: str):
+        """Remember a newly processed token and append it to the on-disk log"""
+        self._remember_token(contract_address)
+        self._append_tokens_log(contract_address)
+        self._tokens_dirty = True
 
     async def add_processed_token(self, contract_address: str):
         """Add token to processed list"""
         if not await self.is_token_processed(contract_address):
-            self.processed_tokens.add(contract_address)  # Use add() for sets
-            self.save_processed_tokens()
-            logging.info(f"Added {contract_address} to processed tokens")
+            self._mark_token_processed(contract_address)
+            logging.info("Added %s to processed tokens", contract_address)
+
+    async def watch_connection(self):
+        """Reconnect as soon as Telethon reports a disconnect instead of polling"""
+        while True:
+            try:
+                # Parks with no wake-ups until the current connection drops; when
+                # Telethon gives up reconnecting, the future holds a ConnectionError
+                await self.client.disconnected
+            except Exception:
+                pass
+            logging.warning("Connection lost, attempting to reconnect...")
+            try:
+                await self.client.connect()
+            except Exception:
+                logging.exception("Reconnect error")
+                await asyncio.sleep(60)  # Wait before retry
 
     async def monitor_health(self):
-        """Monitor bot health and connection"""
+        """Periodically log bot health statistics"""
+        loop = asyncio.get_running_loop()
+        next_report = loop.time()
+        backoff = 60  # Retry delay after an error, doubled on each consecutive failure
         while True:
             try:
-                # Check connection without await
-                if not self.client.is_connected():
-                    logging.warning("Connection lost, attempting to reconnect...")
-                    await self.client.connect()
+                hours, remainder = divmod(int(time.monotonic() - self.start_time), 3600)
+                minutes = remainder // 60
                 
-                uptime = time.time() - self.start_time
-                hours = int(uptime // 3600)
-                minutes = int((uptime % 3600) // 60)
+                # Round-trip to Telegram so a stalled connection surfaces here
+                ping_start = loop.time()
+                await self.client.get_me()
+                ping_ms = (loop.time() - ping_start) * 1000
                 
                 logging.info(
-                    f"Health Check:\n"
-                    f"* Messages Processed: {self.processed_count}\n"
-                    f"* Tokens Forwarded: {self.forwarded_count}\n"
-                    f"* Unique Tokens: {len(self.processed_tokens)}\n"
-                    f"* Uptime: {hours}h {minutes}m\n"
-                    f"* Monitoring: {len(self.source_chats)} chats"
+                    _HEALTH_REPORT,
+                    self.processed_count,
+                    self.forwarded_count,
+                    len(self.processed_tokens),
+                    hours,
+                    minutes,
+                    ping_ms,
+                    len(self.source_chats)
                 )
                 
-                await asyncio.sleep(3600)  # Check every hour
-            except Exception as e:
-                logging.error(f"Health monitor error: {e}")
-                await asyncio.sleep(60)  # Wait before retry
+                # Sleep until a fixed deadline so reports don't drift; the jitter
+                # is applied per sleep and never accumulates into the schedule.
+                # Ticks missed behind a slow ping are skipped, not replayed
+                next_report = max(next_report + HEALTH_CHECK_INTERVAL, loop.time())
+                backoff = 60
+                jitter = random.uniform(-HEALTH_CHECK_JITTER, HEALTH_CHECK_JITTER)
+                await asyncio.sleep(max(0, next_report + jitter - loop.time()))
+            except Exception:
+                logging.exception("Health monitor error")
+                await asyncio.sleep(backoff)  # Wait before retry
+                backoff = min(backoff * 2, HEALTH_CHECK_INTERVAL)
+                next_report = loop.time()  # Re-anchor so the recovery report starts a fresh schedule
 
     async def run(self):
         try:
             started = await self.start()
             if started:
-                print("\n🤖 Bot is running!")
-                print("Press Ctrl+C to stop at any time.")
+                print("\n🤖 Bot is running!\nPress Ctrl+C to stop at any time.")
         except KeyboardInterrupt:
             logging.info("Bot stopped by user.")
         finally:
-            self.save_processed_tokens()
+            await self.save_processed_tokens_async()
+            self.close_tokens_log()
+            await self.token_tracker.aclose()
             await self.client.disconnect()
 
     async def verify_access(self):
@@ -1166,7 +1522,7 @@ DEBUG=false
             # If not verified, show instructions
             print("\n❌ Bot verification needed")
             print("\nPlease start the bot:")
-            print(f"1. Click this link: https://t.me/{PRIMARY_BOT['username']}?start={PRIMARY_BOT['ref']}")
+            print(f"1. Click this link: {REFERRAL_URL}")
             print("\nSteps:")
             print("1. Click the link above")
             print("2. Click 'Start' in the bot chat")
@@ -1180,7 +1536,7 @@ DEBUG=false
                 return True
             
             print("\n❌ Please start the bot first:")
-            print(f"Link: https://t.me/{PRIMARY_BOT['username']}?start={PRIMARY_BOT['ref']}")
+            print(f"Link: {REFERRAL_URL}")
             return False
             
         except Exception as e:
@@ -1222,35 +1578,31 @@ DEBUG=false
         print("=" * 50)
         print(f"Setting up filters for {len(self.source_chats)} selected chats...")
         
-        for i, chat_id in enumerate(self.source_chats, 1):
-            # Get chat name from dialogs
-            chat_name = None
-            try:
-                entity = await self.client.get_entity(chat_id)
-                chat_name = entity.title
-            except:
-                chat_name = str(chat_id)
+        # Resolve every chat name up front rather than one round-trip per chat
+        chat_names = await self.get_chat_names(self.source_chats)
+        for i, (chat_id, chat_name) in enumerate(zip(self.source_chats, chat_names), 1):
+            chat_name = chat_name or str(chat_id)
             
             # Ensure consistent chat ID format
-            chat_id_str = str(chat_id) if chat_id > 0 else str(chat_id)
+            chat_key = self.chat_key(chat_id)
             
             print(f"\n🔍 Chat {i} of {len(self.source_chats)}")
             print(f"Channel: {chat_name}")
-            print(f"Chat ID: {chat_id_str}")
+            print(f"Chat ID: {chat_id}")
             print("=" * 50)
             
             filtered_users = await self.display_user_filter_menu(chat_id)
             if filtered_users:
-                # Convert user IDs to strings for storage
-                self.filtered_users[chat_id_str] = [int(user_id) for user_id in filtered_users]
+                # Store as a frozenset for O(1) sender checks
+                self.filtered_users[chat_key] = frozenset(self.normalize_user_id(user_id) for user_id in filtered_users)
                 print(f"✅ User filter set for {chat_name}")
                 # Save immediately after setting filters
                 self.save_config()
                 print(f"💾 Saved {len(filtered_users)} filtered users for {chat_name}")
             else:
                 # Remove any existing filters for this chat
-                if chat_id_str in self.filtered_users:
-                    del self.filtered_users[chat_id_str]
+                if chat_key in self.filtered_users:
+                    del self.filtered_users[chat_key]
                     self.save_config()
                 print(f"👥 Monitoring all users in {chat_name}")
             
@@ -1263,19 +1615,17 @@ DEBUG=false
         # Show summary and verify saved filters
         print("\n📊 Configuration Summary")
         print("=" * 50)
-        for chat_id in self.source_chats:
-            try:
-                entity = await self.client.get_entity(chat_id)
-                chat_name = entity.title
-                if str(chat_id) in self.filtered_users:
-                    user_count = len(self.filtered_users[str(chat_id)])
-                    filtered_users_list = self.filtered_users[str(chat_id)]
-                    print(f"✓ {chat_name}: Monitoring {user_count} specific users")
-                    print("  User IDs:", filtered_users_list)
-                else:
-                    print(f"✓ {chat_name}: Monitoring all users")
-            except:
+        for chat_id, chat_name in zip(self.source_chats, chat_names):
+            if chat_name is None:
                 print(f"✓ Chat {chat_id}: Configuration saved")
+                continue
+            filtered_users_list = self.filtered_users.get(self.chat_key(chat_id))
+            if filtered_users_list is not None:
+                user_count = len(filtered_users_list)
+                print(f"✓ {chat_name}: Monitoring {user_count} specific users")
+                print("  User IDs:", sorted(filtered_users_list))
+            else:
+                print(f"✓ {chat_name}: Monitoring all users")
         
         # Verify config was saved
         print("\n🔍 Verifying saved configuration...")
@@ -1326,7 +1676,7 @@ DEBUG=false
                     for idx in selected:
                         if 0 <= idx < len(tokens):
                             address, info = tokens[idx]
-                            self.token_tracker.remove_token(address)
+                            await self.token_tracker.remove_token(address)
                             removed.append(info['name'])
                     
                     if removed:
@@ -1342,7 +1692,7 @@ DEBUG=false
             confirm = input("\n⚠️ Are you sure you want to remove ALL tracked tokens? (y/n): ").lower()
             if confirm == 'y':
                 for address in list(self.token_tracker.tracked_tokens.keys()):
-                    self.token_tracker.remove_token(address)
+                    await self.token_tracker.remove_token(address)
                 print("\n✅ All tokens removed")
             else:
                 print("\n❌ Operation cancelled")
@@ -1364,22 +1714,35 @@ async def main():
         # Initialize TokenTracker
         token_tracker = None
         if TRACKING_CHAT:
-            token_tracker = TokenTracker(client, notification_target=TRACKING_CHAT)
+            token_tracker = TokenTracker(client, notification_target=TRACKING_CHAT, target_chat=ENV.get('TARGET_CHAT'))
             print("✅ Token Tracker initialized")
         
         # Run initial cleanup and catchup
         if token_tracker:
             await token_tracker.initial_cleanup()
         
-        # Create SimpleSolListener instance
-        listener = SimpleSolListener(client=client)
+        # Create SimpleSolListener instance, sharing the tracker so one HTTP pool serves the whole run
+        listener = SimpleSolListener(client=client, token_tracker=token_tracker)
         
         # Show startup menu and handle user interaction
-        await listener.start()
+        try:
+            await listener.start()
+        finally:
+            # Synchronous so pending tokens are written even while tasks are being cancelled
+            listener.save_if_dirty()
+            listener.close_tokens_log()
+            await listener.token_tracker.aclose()
         
     except Exception as e:
-        logging.error(f"Error in main function: {str(e)}")
+        logging.error("Error in main function: %s", e)
         logging.exception("Full traceback:")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # Treat SIGTERM (docker stop, systemd) like Ctrl+C so shutdown cleanup still runs
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        import uvloop  # Optional: libuv-based event loop (not available on Windows)
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main()) 
\ No newline at end of file
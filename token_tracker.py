@@ -1,17 +1,64 @@
-import aiohttp
 import asyncio
-import json
+import orjson
 from datetime import datetime
 import logging
-from typing import Dict, Optional, List
+from typing import Optional, List
 import time
-import math
 import os
 from pathlib import Path
 import re
+import tempfile
+from collections import deque
+
+# Compiled once at import; these run for every message scanned
+_CA_PATTERNS = (
+    # Buy/Sell message format
+    re.compile(r'(?:Buy|Sell)\s+\$[^\n]+\n([1-9A-HJ-NP-Za-km-z]{32,44})', re.MULTILINE),
+    # Share token format
+    re.compile(r'Share token with your Reflink\s*\n([1-9A-HJ-NP-Za-km-z]{32,44})', re.MULTILINE),
+    # Direct contract address
+    re.compile(r'^([1-9A-HJ-NP-Za-km-z]{32,44})$', re.MULTILINE),
+    # Dexscreener link
+    re.compile(r'dexscreener\.com/solana/([1-9A-HJ-NP-Za-km-z]{32,44})', re.MULTILINE),
+    # Other common links
+    re.compile(r'(?:birdeye\.so/token|solscan\.io/token|jup\.ag/swap/[^-]+-)([1-9A-HJ-NP-Za-km-z]{32,44})', re.MULTILINE)
+)
+
+_MCAP_PATTERNS = (
+    re.compile(r'MC:\s*\$([0-9,.]+)([KMB])?', re.IGNORECASE),  # Standard format: MC: $161.83K
+    re.compile(r'Market Cap:\s*\$([0-9,.]+)([KMB])?', re.IGNORECASE),  # Full format: Market Cap: $161.83K
+    re.compile(r'MCap:\s*\$([0-9,.]+)([KMB])?', re.IGNORECASE),  # Short format: MCap: $161.83K
+    re.compile(r'MC\s*\$([0-9,.]+)([KMB])?', re.IGNORECASE),  # No colon: MC $161.83K
+    re.compile(r'MC\s+([0-9,.]+)([KMB])?', re.IGNORECASE),  # No dollar sign: MC 161.83K
+    re.compile(r'\$([0-9,.]+)([KMB])?\s+MC', re.IGNORECASE),  # Reversed format: $161.83K MC
+)
+
+_MCAP_MULTIPLIERS = {
+    'K': 1_000,
+    'M': 1_000_000,
+    'B': 1_000_000_000,
+    'k': 1_000,
+    'm': 1_000_000,
+    'b': 1_000_000_000,
+    None: 1
+}
+
+_BUY_NAME_RE = re.compile(r'Buy \$([^\s—]+)')
+
+def _atomic_write(path: Path, data: bytes):
+    """Write data via a unique temp file and rename, so a crash or a concurrent
+    writer never leaves a partial file"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
 class TokenTracker:
-    def __init__(self, telegram_client, notification_target: str = 'me'):
+    def __init__(self, telegram_client, notification_target: str = 'me', target_chat: Optional[str] = None):
         # Configure logging to be less verbose
         logging.getLogger().setLevel(logging.WARNING)  # Set default level to WARNING
         self.tracked_tokens = {}  # {token_address: {initial_mcap, name, symbol, last_notified_multiple}}
@@ -19,22 +66,13 @@ class TokenTracker:
         self.client = telegram_client
         self.JUPITER_BASE_URL = "https://api.jup.ag/price/v2"
         self.notification_target = notification_target  # Where to send notifications ('me' for Saved Messages)
-        self.target_chat = os.getenv('TARGET_CHAT')  # Chat to monitor for buy/sell messages
+        self.target_chat = target_chat or os.getenv('TARGET_CHAT')  # Chat to monitor for buy/sell messages
+        self._session = None  # Shared aiohttp session, created lazily on first request
         
-        # Initialize tracked_tokens.json and sold_tokens.json
+        # Load tracked_tokens.json and sold_tokens.json, creating them if missing
         self.tokens_file = Path('tracked_tokens.json')
         self.sold_tokens_file = Path('sold_tokens.json')
         
-        if not self.tokens_file.exists():
-            print("✨ Creating tracked tokens file...")
-            self.save_tracked_tokens()
-            print("✓ tracked_tokens.json created")
-            
-        if not self.sold_tokens_file.exists():
-            print("✨ Creating sold tokens file...")
-            self.save_sold_tokens()
-            print("✓ sold_tokens.json created")
-        
         self.load_tracked_tokens()
         self.load_sold_tokens()
         
@@ -42,7 +80,9 @@ class TokenTracker:
         self.RATE_LIMIT_CALLS = 600
         self.RATE_LIMIT_WINDOW = 60  # seconds
         self.MIN_CHECK_INTERVAL = 60  # Minimum time between checks for each token
-        self.api_call_times = []
+        self.api_call_times = deque()  # Timestamps of calls in the current window, oldest first
+        self._rate_lock = asyncio.Lock()  # Concurrent token checks share the window
+        self._save_lock = asyncio.Lock()  # Keeps concurrent saves from writing the file at once
         
         # Batch processing
         self.current_batch_index = 0
@@ -67,18 +107,44 @@ class TokenTracker:
             "Price: $",                 # Price indicator
             "Renounced ✅"              # Renounced indicator
         ]
+        
+        # Lowercased once for the case-insensitive scans over message history
+        self._buy_indicators_lower = tuple(indicator.lower() for indicator in self.buy_indicators)
+        self._sell_indicators_lower = tuple(indicator.lower() for indicator in self.sell_indicators)
+        
+        # Token name following a buy indicator, built once from the list above
+        self._buy_indicator_name_re = re.compile(r'(?i)(?:' + '|'.join(self.buy_indicators) + r')\s+(?:into\s+)?(\w+)')
 
     async def initialize(self):
         """Run initial cleanup after client is connected"""
         await self.initial_cleanup()
 
+    async def _get_session(self):
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            import aiohttp  # Deferred: only needed once market caps are fetched
+            # Keep idle connections past the once-a-minute check cycle, and cap
+            # each request so one stalled endpoint can't hang a whole batch
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     def load_tracked_tokens(self):
         """Load tracked tokens from JSON file"""
         try:
-            with open(self.tokens_file, 'r') as f:
-                self.tracked_tokens = json.load(f)
+            with open(self.tokens_file, 'rb') as f:
+                self.tracked_tokens = orjson.loads(f.read())
             
             # Migrate old format tokens to new format
+            migrated = False
             for address, info in self.tracked_tokens.items():
                 if isinstance(info.get('last_check'), (int, float)):
                     old_timestamp = info['last_check']
@@ -89,43 +155,60 @@ class TokenTracker:
                         'mcap': info['initial_mcap'],  # Use initial mcap as placeholder
                         'multiple': 1.0  # Reset multiple
                     }
-                    self.save_tracked_tokens()  # Save the migrated data
+                    migrated = True
+            if migrated:
+                self.save_tracked_tokens()  # Save the migrated data once
             
             logging.info(f"Loaded {len(self.tracked_tokens)} tracked tokens")
         except FileNotFoundError:
             self.tracked_tokens = {}
             logging.info("No tracked tokens file found, starting fresh")
-        except json.JSONDecodeError:
+            print("✨ Creating tracked tokens file...")
+            self.save_tracked_tokens()
+            print("✓ tracked_tokens.json created")
+        except orjson.JSONDecodeError:
             self.tracked_tokens = {}
             logging.warning("Tracked tokens file was corrupted, starting fresh")
 
     def save_tracked_tokens(self):
         """Save tracked tokens to JSON file"""
+        self._write_tracked_tokens(orjson.dumps(self.tracked_tokens, option=orjson.OPT_INDENT_2), len(self.tracked_tokens))
+
+    async def save_tracked_tokens_async(self):
+        """Save tracked tokens from a worker thread so the event loop isn't blocked"""
+        async with self._save_lock:
+            # Serialize on the loop thread; the dict may change while the write is in flight
+            data = orjson.dumps(self.tracked_tokens, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(self._write_tracked_tokens, data, len(self.tracked_tokens))
+
+    def _write_tracked_tokens(self, data: bytes, count: int):
+        """Write serialized tracked tokens to disk"""
         try:
-            with open(self.tokens_file, 'w') as f:
-                json.dump(self.tracked_tokens, f, indent=2)
-            logging.info(f"Saved {len(self.tracked_tokens)} tracked tokens")
+            _atomic_write(self.tokens_file, data)
+            logging.info(f"Saved {count} tracked tokens")
         except Exception as e:
             logging.error(f"Error saving tracked tokens: {str(e)}")
 
     def load_sold_tokens(self):
         """Load sold tokens from JSON file"""
         try:
-            with open(self.sold_tokens_file, 'r') as f:
-                self.sold_tokens = set(json.load(f))
+            with open(self.sold_tokens_file, 'rb') as f:
+                self.sold_tokens = set(orjson.loads(f.read()))
             logging.info(f"Loaded {len(self.sold_tokens)} sold tokens")
         except FileNotFoundError:
             self.sold_tokens = set()
             logging.info("No sold tokens file found, starting fresh")
-        except json.JSONDecodeError:
+            print("✨ Creating sold tokens file...")
+            self.save_sold_tokens()
+            print("✓ sold_tokens.json created")
+        except orjson.JSONDecodeError:
             self.sold_tokens = set()
             logging.warning("Sold tokens file was corrupted, starting fresh")
 
     def save_sold_tokens(self):
         """Save sold tokens to JSON file"""
         try:
-            with open(self.sold_tokens_file, 'w') as f:
-                json.dump(list(self.sold_tokens), f, indent=2)
+            _atomic_write(self.sold_tokens_file, orjson.dumps(list(self.sold_tokens), option=orjson.OPT_INDENT_2))
             logging.info(f"Saved {len(self.sold_tokens)} sold tokens")
         except Exception as e:
             logging.error(f"Error saving sold tokens: {str(e)}")
@@ -147,14 +230,14 @@ class TokenTracker:
                 },
                 'failed_checks': 0
             }
-            self.save_tracked_tokens()
+            await self.save_tracked_tokens_async()
             logging.info(f"Started tracking {name} ({address}) with initial mcap: ${initial_mcap:,.2f}")
 
-    def remove_token(self, address: str):
+    async def remove_token(self, address: str):
         if address in self.tracked_tokens:
             token_info = self.tracked_tokens.pop(address)
             self.sold_tokens.add(address)  # Add to sold tokens set
-            self.save_tracked_tokens()
+            await self.save_tracked_tokens_async()
             self.save_sold_tokens()
             logging.info(f"Stopped tracking {token_info['name']} ({address}) and added to sold tokens")
 
@@ -176,23 +259,25 @@ class TokenTracker:
             return tokens[start_idx:start_idx + batch_size]
 
     async def wait_for_rate_limit(self):
-        """Implement token bucket rate limiting"""
-        current_time = time.time()
-        
-        # Remove API calls outside the current window
-        self.api_call_times = [t for t in self.api_call_times if current_time - t < self.RATE_LIMIT_WINDOW]
-        
-        # If we've hit the rate limit, wait
-        if len(self.api_call_times) >= self.RATE_LIMIT_CALLS:
-            wait_time = self.api_call_times[0] + self.RATE_LIMIT_WINDOW - current_time
-            if wait_time > 0:
+        """Implement sliding window rate limiting"""
+        async with self._rate_lock:
+            while True:
+                current_time = time.time()
+                
+                # Remove API calls outside the current window
+                while self.api_call_times and current_time - self.api_call_times[0] >= self.RATE_LIMIT_WINDOW:
+                    self.api_call_times.popleft()
+                
+                if len(self.api_call_times) < self.RATE_LIMIT_CALLS:
+                    break
+                
+                # We've hit the rate limit; wait for the oldest call to leave the window
+                wait_time = self.api_call_times[0] + self.RATE_LIMIT_WINDOW - current_time
                 logging.info(f"Rate limit reached, waiting {wait_time:.2f} seconds")
                 await asyncio.sleep(wait_time)
-                # Recursive call to ensure we're now under the limit
-                await self.wait_for_rate_limit()
-        
-        # Add this call to our window
-        self.api_call_times.append(current_time)
+            
+            # Add this call to our window
+            self.api_call_times.append(current_time)
 
     async def get_current_mcap(self, address: str) -> Optional[float]:
         """Get current market cap with retries and GeckoTerminal backup"""
@@ -201,36 +286,36 @@ class TokenTracker:
             try:
                 await self.wait_for_rate_limit()
                 
-                async with aiohttp.ClientSession() as session:
-                    # Get price in USDC from Jupiter
-                    url = f"{self.JUPITER_BASE_URL}?ids={address}"
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data and isinstance(data, dict) and 'data' in data:
-                                token_data = data['data'].get(address)
-                                if token_data and 'price' in token_data:
-                                    price = float(token_data['price'])
+                session = await self._get_session()
+                # Get price in USDC from Jupiter
+                url = f"{self.JUPITER_BASE_URL}?ids={address}"
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        if data and isinstance(data, dict) and 'data' in data:
+                            token_data = data['data'].get(address)
+                            if token_data and 'price' in token_data:
+                                price = float(token_data['price'])
                                     
-                                    # Get token supply from Solana RPC
-                                    supply_url = "https://api.mainnet-beta.solana.com"
-                                    supply_payload = {
-                                        "jsonrpc": "2.0",
-                                        "id": 1,
-                                        "method": "getTokenSupply",
-                                        "params": [address]
-                                    }
-                                    async with session.post(supply_url, json=supply_payload) as supply_response:
-                                        if supply_response.status == 200:
-                                            supply_data = await supply_response.json()
-                                            if supply_data and 'result' in supply_data:
-                                                supply = float(supply_data['result']['value']['amount']) / 10 ** supply_data['result']['value']['decimals']
-                                                mcap = price * supply
-                                                logging.info(f"Got market cap from Jupiter for {address}: ${mcap:,.2f}")
-                                                return mcap
+                                # Get token supply from Solana RPC
+                                supply_url = "https://api.mainnet-beta.solana.com"
+                                supply_payload = {
+                                    "jsonrpc": "2.0",
+                                    "id": 1,
+                                    "method": "getTokenSupply",
+                                    "params": [address]
+                                }
+                                async with session.post(supply_url, json=supply_payload) as supply_response:
+                                    if supply_response.status == 200:
+                                        supply_data = await supply_response.json()
+                                        if supply_data and 'result' in supply_data:
+                                            supply = float(supply_data['result']['value']['amount']) / 10 ** supply_data['result']['value']['decimals']
+                                            mcap = price * supply
+                                            logging.info(f"Got market cap from Jupiter for {address}: ${mcap:,.2f}")
+                                            return mcap
                                         
-                                        error_msg = f"❌ Could not fetch token supply for {address}"
-                                        logging.error(error_msg)
+                                    error_msg = f"❌ Could not fetch token supply for {address}"
+                                    logging.error(error_msg)
                 
                 if attempt < 2:  # Don't sleep on last attempt
                     await asyncio.sleep(2)  # Wait 2 seconds before retry
@@ -246,25 +331,25 @@ class TokenTracker:
         # If Jupiter fails, try GeckoTerminal API as backup
         try:
             logging.warning(f"Trying GeckoTerminal API as backup for {address}")
-            async with aiohttp.ClientSession() as session:
-                # Get token data from GeckoTerminal
-                gecko_url = f"https://api.geckoterminal.com/api/v2/networks/solana/tokens/{address}"
-                headers = {"Accept": "application/json"}  # GeckoTerminal requires this header
-                async with session.get(gecko_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and 'data' in data and 'attributes' in data['data']:
-                            attrs = data['data']['attributes']
-                            if 'fdv_usd' in attrs and attrs['fdv_usd'] is not None:
-                                mcap = float(attrs['fdv_usd'])
-                                logging.info(f"Got market cap from GeckoTerminal for {address}: ${mcap:,.2f}")
-                                return mcap
-                            elif 'market_cap_usd' in attrs and attrs['market_cap_usd'] is not None:
-                                mcap = float(attrs['market_cap_usd'])
-                                logging.info(f"Got market cap from GeckoTerminal for {address}: ${mcap:,.2f}")
-                                return mcap
-                    else:
-                        logging.error(f"❌ GeckoTerminal API Error ({response.status}): Could not fetch data for {address}")
+            session = await self._get_session()
+            # Get token data from GeckoTerminal
+            gecko_url = f"https://api.geckoterminal.com/api/v2/networks/solana/tokens/{address}"
+            headers = {"Accept": "application/json"}  # GeckoTerminal requires this header
+            async with session.get(gecko_url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data and 'data' in data and 'attributes' in data['data']:
+                        attrs = data['data']['attributes']
+                        if 'fdv_usd' in attrs and attrs['fdv_usd'] is not None:
+                            mcap = float(attrs['fdv_usd'])
+                            logging.info(f"Got market cap from GeckoTerminal for {address}: ${mcap:,.2f}")
+                            return mcap
+                        elif 'market_cap_usd' in attrs and attrs['market_cap_usd'] is not None:
+                            mcap = float(attrs['market_cap_usd'])
+                            logging.info(f"Got market cap from GeckoTerminal for {address}: ${mcap:,.2f}")
+                            return mcap
+                else:
+                    logging.error(f"❌ GeckoTerminal API Error ({response.status}): Could not fetch data for {address}")
                         
         except Exception as e:
             logging.error(f"❌ GeckoTerminal API Error: Could not fetch data for {address}: {str(e)}")
@@ -296,7 +381,7 @@ class TokenTracker:
             return f"{days} day{'s' if days != 1 else ''} ago"
 
     async def process_token(self, address: str, current_time: float):
-        """Process a single token"""
+        """Process a single token (the caller saves tracked_tokens after the batch)"""
         info = self.tracked_tokens[address]
         
         # Get fresh timestamp for this check
@@ -311,7 +396,6 @@ class TokenTracker:
                 'mcap': info['initial_mcap'],
                 'multiple': 1.0
             }
-            self.save_tracked_tokens()
         
         # Skip if checked too recently
         if check_time - info['last_check']['time'] < self.MIN_CHECK_INTERVAL:
@@ -333,7 +417,6 @@ class TokenTracker:
                 'multiple': multiple
             }
             info['failed_checks'] = 0
-            self.save_tracked_tokens()
             
             # Only log significant changes (more than 10% change in multiple)
             last_multiple = info.get('last_logged_multiple', multiple)
@@ -368,18 +451,26 @@ class TokenTracker:
                 )
                 await self.client.send_message(self.notification_target, message)
                 self.tracked_tokens[address]['last_notified_multiple'] = current_whole_multiple
-                self.save_tracked_tokens()
+                await self.save_tracked_tokens_async()
                 logging.warning(f"🎯 Sent {current_whole_multiple}x notification for {info['name']}")
         else:
             # Log failed check attempt
             info['failed_checks'] = info.get('failed_checks', 0) + 1
-            self.save_tracked_tokens()
             
             # Only notify after 5 consecutive failures
             if info['failed_checks'] >= 5:
                 info['failed_checks'] = 0  # Reset counter
                 logging.error(f"❌ Failed to get market cap for {info['name']} ({address}) after 5 attempts")
 
+    async def _safe_process_token(self, address: str, current_time: float) -> bool:
+        """Process a single token, logging failures so the rest of the batch carries on"""
+        try:
+            await self.process_token(address, current_time)
+            return True
+        except Exception as e:
+            logging.error(f"Error processing token {address}: {str(e)}")
+            return False
+
     async def check_and_notify_multipliers(self):
         """Check token market caps and notify on multipliers"""
         error_notification_threshold = 5  # Only notify after this many errors
@@ -410,19 +501,19 @@ class TokenTracker:
                 # Process all tokens at once, since we're only checking once per minute
                 batch = list(self.tracked_tokens.keys())
                 
-                success_count = 0
-                error_count = 0
+                # Process batch concurrently; the rate limiter and session pool bound the fan-out
+                results = await asyncio.gather(
+                    *(self._safe_process_token(address, current_time) for address in batch)
+                )
+                success_count = sum(results)
+                error_count = len(batch) - success_count
+                if success_count:
+                    error_count_total = 0  # Reset total error count on success
+                else:
+                    error_count_total += error_count
                 
-                # Process batch
-                for address in batch:
-                    try:
-                        await self.process_token(address, current_time)
-                        success_count += 1
-                        error_count_total = 0  # Reset total error count on success
-                    except Exception as e:
-                        error_count += 1
-                        error_count_total += 1
-                        logging.error(f"Error processing token {address}: {str(e)}")
+                # Persist the whole batch's check results with a single write
+                await self.save_tracked_tokens_async()
                 
                 # Log processing info
                 logging.info(
@@ -518,6 +609,7 @@ class TokenTracker:
                 messages.append(message)
             
             # Process messages to determine current holdings
+            ca_messages = []  # (message, ca) pairs so the batch is only scanned once
             for message in messages:
                 if not message or not message.message:
                     continue
@@ -526,16 +618,17 @@ class TokenTracker:
                 ca = await self.extract_ca_from_message(message.message)
                 if not ca:
                     continue
+                ca_messages.append((message, ca))
                 
                 # Only process if we haven't seen this token yet or if this message is newer
                 current_state = token_states.get(ca)
                 if current_state is None or message.date.timestamp() > current_state['time']:
                     # Check for sell messages first (they take precedence)
-                    if any(indicator.lower() in text for indicator in self.sell_indicators):
+                    if any(indicator in text for indicator in self._sell_indicators_lower):
                         token_states[ca] = {'action': 'sell', 'time': message.date.timestamp()}
                         logging.info(f"Found sell for {ca}")
                     # Then check for buy messages
-                    elif any(indicator.lower() in text for indicator in self.buy_indicators):
+                    elif any(indicator in text for indicator in self._buy_indicators_lower):
                         token_states[ca] = {'action': 'buy', 'time': message.date.timestamp()}
                         logging.info(f"Found buy for {ca}")
             
@@ -547,7 +640,7 @@ class TokenTracker:
                     token_info = self.tracked_tokens[address]
                     reason = "not found in recent history" if state is None else "token was sold"
                     logging.warning(f"Removing {token_info['name']} ({address}) - {reason}")
-                    self.remove_token(address)
+                    await self.remove_token(address)
                     cleanup_count += 1
             
             # Add any missing tokens we are holding
@@ -555,15 +648,15 @@ class TokenTracker:
             for address, state in token_states.items():
                 if state['action'] == 'buy' and address not in self.tracked_tokens and address not in self.sold_tokens:
                     # Find the buy message to get initial mcap
-                    for message in messages:
-                        if not message.message:
+                    for message, msg_ca in ca_messages:
+                        if msg_ca != address:
                             continue
-                        msg_ca = await self.extract_ca_from_message(message.message)
-                        if msg_ca == address and any(indicator.lower() in message.message.lower() for indicator in self.buy_indicators):
+                        message_lower = message.message.lower()
+                        if any(indicator in message_lower for indicator in self._buy_indicators_lower):
                             initial_mcap = await self.extract_mcap_from_message(message.message)
                             if initial_mcap:
                                 # Extract name from message
-                                name_match = re.search(r'Buy \$([^\s—]+)', message.message)
+                                name_match = _BUY_NAME_RE.search(message.message)
                                 name = name_match.group(1) if name_match else address[:6]
                                 await self.add_token(address, name, initial_mcap)
                                 added_count += 1
@@ -609,26 +702,26 @@ class TokenTracker:
                     continue
                 
                 # Check for sell signals first
-                if any(indicator.lower() in text for indicator in self.sell_indicators):
+                if any(indicator in text for indicator in self._sell_indicators_lower):
                     if ca in temp_tracked:
                         del temp_tracked[ca]
                         temp_sold.add(ca)
                         tokens_removed += 1
                         logging.warning(f"Found sell signal for {ca} in catchup check")
                     if ca in self.tracked_tokens:
-                        self.remove_token(ca)
+                        await self.remove_token(ca)
                         tokens_removed += 1
                         logging.warning(f"Removed tracked token {ca} due to sell signal")
                 
                 # Then check for buy signals
-                elif any(indicator.lower() in text for indicator in self.buy_indicators):
+                elif any(indicator in text for indicator in self._buy_indicators_lower):
                     # Only process if not sold and not already tracked
                     if ca not in temp_sold and ca not in self.sold_tokens and ca not in temp_tracked and ca not in self.tracked_tokens:
                         # Get initial market cap
                         initial_mcap = await self.get_current_mcap(ca)
                         if initial_mcap:
                             # Try to extract name from message
-                            name_match = re.search(r'(?i)(?:' + '|'.join(self.buy_indicators) + r')\s+(?:into\s+)?(\w+)', text)
+                            name_match = self._buy_indicator_name_re.search(text)
                             name = name_match.group(1).upper() if name_match else ca[:6]
                             
                             temp_tracked[ca] = {
@@ -655,28 +748,11 @@ class TokenTracker:
         """Extract market cap from message text"""
         try:
             # Multiple patterns for market cap
-            patterns = [
-                r'MC:\s*\$([0-9,.]+)([KMB])?',  # Standard format: MC: $161.83K
-                r'Market Cap:\s*\$([0-9,.]+)([KMB])?',  # Full format: Market Cap: $161.83K
-                r'MCap:\s*\$([0-9,.]+)([KMB])?',  # Short format: MCap: $161.83K
-                r'MC\s*\$([0-9,.]+)([KMB])?',  # No colon: MC $161.83K
-                r'MC\s+([0-9,.]+)([KMB])?',  # No dollar sign: MC 161.83K
-                r'\$([0-9,.]+)([KMB])?\s+MC',  # Reversed format: $161.83K MC
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in _MCAP_PATTERNS:
+                match = pattern.search(text)
                 if match:
                     value = float(match.group(1).replace(',', ''))
-                    multiplier = {
-                        'K': 1_000,
-                        'M': 1_000_000,
-                        'B': 1_000_000_000,
-                        'k': 1_000,
-                        'm': 1_000_000,
-                        'b': 1_000_000_000,
-                        None: 1
-                    }[match.group(2)]
+                    multiplier = _MCAP_MULTIPLIERS[match.group(2)]
                     mcap = value * multiplier
                     logging.info(f"Found market cap: ${mcap:,.2f}")
                     return mcap
@@ -701,21 +777,8 @@ class TokenTracker:
             return None
         
         # Common patterns in your messages
-        patterns = [
-            # Buy/Sell message format
-            r'(?:Buy|Sell)\s+\$[^\n]+\n([1-9A-HJ-NP-Za-km-z]{32,44})',
-            # Share token format
-            r'Share token with your Reflink\s*\n([1-9A-HJ-NP-Za-km-z]{32,44})',
-            # Direct contract address
-            r'^([1-9A-HJ-NP-Za-km-z]{32,44})$',
-            # Dexscreener link
-            r'dexscreener\.com/solana/([1-9A-HJ-NP-Za-km-z]{32,44})',
-            # Other common links
-            r'(?:birdeye\.so/token|solscan\.io/token|jup\.ag/swap/[^-]+-)([1-9A-HJ-NP-Za-km-z]{32,44})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.MULTILINE)
+        for pattern in _CA_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -729,7 +792,7 @@ class TokenTracker:
                 text = message.lower()
                 # Check if it's really a sell message
                 if any(indicator in text for indicator in self.sell_indicators):
-                    self.remove_token(ca)
+                    await self.remove_token(ca)
                     
                     # Send notification about stopping tracking
                     await self.client.send_message(